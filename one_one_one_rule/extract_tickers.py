@@ -1,12 +1,54 @@
 from __future__ import annotations
 
+import csv
 from pathlib import Path
 
-import pandas as pd
+import lxml.html
+import requests
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .perf import log_perf
 
 _WIKI_URL = "https://en.wikipedia.org/wiki/Nasdaq-100"
+_WIKI_HEADERS = {
+    "User-Agent": "one-one-one-rule/1.0 (Nasdaq-100 data pipeline)",
+    "Accept-Encoding": "gzip",
+}
+_TICKER_COLUMNS = ("ticker", "ticker symbol", "symbol")
+
+# XPath expressions compiled once at import and reused on every scrape.
+_TICKER_TABLES_XPATH = etree.XPath(
+    '//table[contains(@class, "wikitable")]'
+    '[.//th[re:test(normalize-space(.), "^(ticker|ticker symbol|symbol)$", "i")]]',
+    namespaces={"re": "http://exslt.org/regular-expressions"},
+)
+_HEADER_CELLS_XPATH = etree.XPath("(.//tr[th])[1]/th")
+# Count th and td cells together so row-header cells (<th scope="row">) keep data columns
+# aligned with the header; rows without any td are header rows and are skipped.
+_COLUMN_CELLS_XPATH = etree.XPath(".//tr[td]/*[self::td or self::th][$col]")
+
+
+def _build_session() -> requests.Session:
+    # Shared HTTP session so repeated fetches reuse pooled TCP/TLS connections.
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_SESSION = _build_session()
 
 
 def _normalize_ticker(raw: str) -> str:
@@ -18,27 +60,27 @@ def _normalize_ticker(raw: str) -> str:
     return ticker.replace(".", "-")
 
 
+def _normalize_tickers(raws) -> list[str]:
+    # Normalize and drop empty entries in a single pass.
+    return [ticker for raw in raws if (ticker := _normalize_ticker(raw))]
+
+
 @log_perf
 def _tickers_from_wikipedia() -> list[str]:
     # Scrape the Nasdaq-100 constituents table from Wikipedia.
-    tables = pd.read_html(_WIKI_URL)
-    for table in tables:
-        if not len(table.columns):
-            continue
-        columns = {str(col).strip().lower(): col for col in table.columns}
-        for candidate in ("ticker", "ticker symbol", "symbol"):
-            if candidate in columns:
-                col = columns[candidate]
-                tickers = (
-                    table[col]
-                    .astype(str)
-                    .map(_normalize_ticker)
-                    .dropna()
-                    .tolist()
-                )
-                tickers = [t for t in tickers if t]
+    # Parse with lxml directly so only the ticker column is materialized.
+    resp = _SESSION.get(_WIKI_URL, headers=_WIKI_HEADERS, timeout=20)
+    resp.raise_for_status()
+
+    doc = lxml.html.fromstring(resp.content)
+    for table in _TICKER_TABLES_XPATH(doc):
+        headers = [th.text_content().strip().lower() for th in _HEADER_CELLS_XPATH(table)]
+        for candidate in _TICKER_COLUMNS:
+            if candidate in headers:
+                cells = _COLUMN_CELLS_XPATH(table, col=headers.index(candidate) + 1)
+                tickers = _normalize_tickers(cell.text_content() for cell in cells)
                 if len(tickers) >= 80:
-                    return sorted(set(tickers))
+                    return sorted(dict.fromkeys(tickers))
     return []
 
 
@@ -47,23 +89,22 @@ def _tickers_from_file(path: Path) -> list[str]:
     # Load tickers from a local CSV fallback file.
     if not path.exists():
         return []
-    df = pd.read_csv(path)
-    if df.empty:
-        return []
-    col = df.columns[0]
-    if "symbol" in [c.lower() for c in df.columns]:
-        for c in df.columns:
-            if c.lower() == "symbol":
-                col = c
-                break
-    tickers = df[col].astype(str).map(_normalize_ticker).tolist()
-    tickers = [t for t in tickers if t]
-    return sorted(set(tickers))
+    with path.open(newline="", encoding="utf-8-sig") as fh:
+        reader = csv.reader(fh)
+        header = next(reader, None)
+        if not header:
+            return []
+        lowered = [c.lower() for c in header]
+        col = lowered.index("symbol") if "symbol" in lowered else 0
+        tickers = _normalize_tickers(row[col] for row in reader if len(row) > col)
+    return sorted(dict.fromkeys(tickers))
 
 
 @log_perf
 def load_nasdaq100_tickers(use_wikipedia: bool, fallback_file: Path) -> list[str]:
     # Prefer Wikipedia; fall back to a local list if needed.
+    # Both sources return de-duplicated, sorted tickers; the sort only keeps the
+    # output CSV row order stable between runs (fetching does not depend on it).
     tickers: list[str] = []
     if use_wikipedia:
         try:
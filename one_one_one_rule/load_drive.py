@@ -1,21 +1,28 @@
 from __future__ import annotations
 
+import threading
+from functools import lru_cache
 from pathlib import Path
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials as OAuthCredentials
-from google.oauth2.service_account import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-
 from .perf import log_perf
 
+# Google client libraries are imported inside the functions that use them, so
+# runs with Drive uploads disabled never pay their import time or memory.
+
 _SCOPES = [
     "https://www.googleapis.com/auth/drive.file",
     "https://www.googleapis.com/auth/drive",
 ]
 _SHEET_MIME = "application/vnd.google-apps.spreadsheet"
+# googleapiclient appends "(gzip)" to this, which Drive needs to gzip responses.
+_USER_AGENT = "one-one-one-rule"
+_SERVICE_LOCK = threading.Lock()
+# Files below this size are sent in one multipart request instead of a resumable session.
+_RESUMABLE_MIN_BYTES = 5 * 1024 * 1024
+# Larger files go up in 8 MB chunks; execute() retries each chunk (or the single
+# multipart request) on transient 5xx/429 responses.
+_RESUMABLE_CHUNK_BYTES = 8 * 1024 * 1024
+_UPLOAD_RETRIES = 3
 
 
 def _escape_drive_query(text: str) -> str:
@@ -26,6 +33,8 @@ def _escape_drive_query(text: str) -> str:
 @log_perf
 def _get_service_account_credentials(service_account_file: Path):
     # Load service account credentials from JSON key.
+    from google.oauth2.service_account import Credentials
+
     return Credentials.from_service_account_file(
         service_account_file, scopes=_SCOPES
     )
@@ -34,6 +43,10 @@ def _get_service_account_credentials(service_account_file: Path):
 @log_perf
 def _get_oauth_credentials(oauth_client_file: Path, oauth_token_file: Path):
     # Load or refresh OAuth credentials, storing a token file for reuse.
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials as OAuthCredentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     creds = None
     if oauth_token_file.exists():
         creds = OAuthCredentials.from_authorized_user_file(
@@ -54,6 +67,47 @@ def _get_oauth_credentials(oauth_client_file: Path, oauth_token_file: Path):
     return creds
 
 
+def _all_drives_kwargs(parent_id: str | None) -> dict:
+    # Shared-drive search is only needed when looking inside a specific folder.
+    if not parent_id:
+        return {}
+    return {"supportsAllDrives": True, "includeItemsFromAllDrives": True}
+
+
+def _build_media(file_path: Path, mime_type: str, content: bytes | None = None):
+    # Small files skip the extra round trip needed to open a resumable session.
+    from googleapiclient.http import MediaFileUpload, MediaInMemoryUpload
+
+    if content is not None:
+        # Caller already holds the bytes (e.g. the CSV it just wrote): no disk re-read.
+        return MediaInMemoryUpload(
+            content,
+            mimetype=mime_type,
+            chunksize=_RESUMABLE_CHUNK_BYTES,
+            resumable=len(content) >= _RESUMABLE_MIN_BYTES,
+        )
+    if file_path.stat().st_size < _RESUMABLE_MIN_BYTES:
+        return MediaInMemoryUpload(
+            file_path.read_bytes(), mimetype=mime_type, resumable=False
+        )
+    return MediaFileUpload(
+        str(file_path),
+        mimetype=mime_type,
+        chunksize=_RESUMABLE_CHUNK_BYTES,
+        resumable=True,
+    )
+
+
+def _authorized_http(creds):
+    # Keep-alive HTTP transport that signs requests with the given credentials.
+    import httplib2
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.http import set_user_agent
+
+    http = set_user_agent(httplib2.Http(), _USER_AGENT)
+    return AuthorizedHttp(creds, http=http)
+
+
 @log_perf
 def get_drive_service(
     *,
@@ -63,12 +117,41 @@ def get_drive_service(
     oauth_token_file: Path | None = None,
 ):
     # Build the Drive API client with OAuth or Service Account auth.
+    # Normalize the cache key so equivalent settings share one cached client.
     auth_mode = (auth_mode or "service_account").lower()
+    if auth_mode == "oauth":
+        service_account_file = None
+        oauth_token_file = oauth_token_file or Path("config/oauth_token.json")
+    else:
+        oauth_client_file = None
+        oauth_token_file = None
+
+    # Serialized so concurrent uploads never race the OAuth flow or build twice.
+    with _SERVICE_LOCK:
+        return _build_drive_service(
+            auth_mode=auth_mode,
+            service_account_file=service_account_file,
+            oauth_client_file=oauth_client_file,
+            oauth_token_file=oauth_token_file,
+        )
+
+
+@lru_cache(maxsize=4)
+def _build_drive_service(
+    *,
+    auth_mode: str,
+    service_account_file: Path | None,
+    oauth_client_file: Path | None,
+    oauth_token_file: Path | None,
+):
+    # Cached so repeated uploads skip credential file I/O and share one client.
+    from googleapiclient.discovery import build
+    from googleapiclient.http import HttpRequest
+
     if auth_mode == "oauth":
         if not oauth_client_file or not oauth_client_file.exists():
             raise ValueError("OAuth client file not found. Set GOOGLE_OAUTH_CLIENT_FILE.")
-        token_file = oauth_token_file or Path("config/oauth_token.json")
-        creds = _get_oauth_credentials(oauth_client_file, token_file)
+        creds = _get_oauth_credentials(oauth_client_file, oauth_token_file)
     else:
         if not service_account_file or not service_account_file.exists():
             raise ValueError(
@@ -76,12 +159,29 @@ def get_drive_service(
             )
         creds = _get_service_account_credentials(service_account_file)
 
-    return build("drive", "v3", credentials=creds)
+    # httplib2.Http is not thread-safe, so each thread gets its own transport.
+    local = threading.local()
+
+    def build_request(_http, *args, **kwargs):
+        http = getattr(local, "http", None)
+        if http is None:
+            http = local.http = _authorized_http(creds)
+        return HttpRequest(http, *args, **kwargs)
+
+    return build(
+        "drive",
+        "v3",
+        http=_authorized_http(creds),
+        requestBuilder=build_request,
+        # Use the discovery document bundled with googleapiclient (no HTTP fetch).
+        static_discovery=True,
+        cache_discovery=False,
+    )
 
 
 @log_perf
-def find_existing_file_id(service, name: str, folder_id: str | None) -> str | None:
-    # Find a file by name (and optional parent folder).
+def find_existing_file(service, name: str, folder_id: str | None) -> dict | None:
+    # Find a file by name (and optional parent folder), returning id and mimeType.
     escaped_name = _escape_drive_query(name)
     query = f"name='{escaped_name}' and trashed=false"
     if folder_id:
@@ -91,17 +191,25 @@ def find_existing_file_id(service, name: str, folder_id: str | None) -> str | No
         service.files()
         .list(
             q=query,
-            fields="files(id,name)",
-            pageSize=10,
-            supportsAllDrives=True,
-            includeItemsFromAllDrives=True,
+            fields="files(id,mimeType)",
+            pageSize=1,
+            **_all_drives_kwargs(folder_id),
         )
         .execute()
     )
     files = result.get("files", [])
     if not files:
         return None
-    return files[0].get("id")
+    return files[0]
+
+
+@log_perf
+def find_existing_file_id(service, name: str, folder_id: str | None) -> str | None:
+    # Find a file ID by name (and optional parent folder).
+    existing = find_existing_file(service, name, folder_id)
+    if not existing:
+        return None
+    return existing.get("id")
 
 
 @log_perf
@@ -119,10 +227,9 @@ def find_folder_id(service, name: str, parent_id: str | None = None) -> str | No
         service.files()
         .list(
             q=query,
-            fields="files(id,name)",
-            pageSize=10,
-            supportsAllDrives=True,
-            includeItemsFromAllDrives=True,
+            fields="files(id)",
+            pageSize=1,
+            **_all_drives_kwargs(parent_id),
         )
         .execute()
     )
@@ -166,6 +273,7 @@ def upload_csv(
     oauth_client_file: Path | None = None,
     oauth_token_file: Path | None = None,
     convert_to_sheets: bool = True,
+    content: bytes | None = None,
 ) -> str:
     # Convenience wrapper to upload CSV content.
     return upload_file(
@@ -179,6 +287,7 @@ def upload_csv(
         oauth_token_file=oauth_token_file,
         mime_type="text/csv",
         convert_to_sheets=convert_to_sheets,
+        content=content,
     )
 
 
@@ -195,12 +304,15 @@ def upload_file(
     oauth_token_file: Path | None = None,
     mime_type: str = "application/octet-stream",
     convert_to_sheets: bool = False,
+    content: bytes | None = None,
 ) -> str:
     """
     Uploads a file to Google Drive.
 
     IMPORTANT: For Service Accounts, 'folder_id' is REQUIRED when creating a new file.
     Service Accounts have 0 storage quota and cannot create files in their own root.
+
+    If 'content' is given it is uploaded as the file body instead of reading 'file_path'.
     """
     # Use Drive API to create or update the target file.
     service = get_drive_service(
@@ -209,27 +321,33 @@ def upload_file(
         oauth_client_file=oauth_client_file,
         oauth_token_file=oauth_token_file,
     )
-    media = MediaFileUpload(str(file_path), mimetype=mime_type, resumable=True)
+    media = _build_media(Path(file_path), mime_type, content)
 
-    # 1. Try to find existing file if ID not provided
+    # 1. Try to find existing file if ID not provided (the lookup also returns its mimeType)
+    existing_mime = None
     if not file_id:
-        file_id = find_existing_file_id(service, file_name, folder_id)
+        existing = find_existing_file(service, file_name, folder_id)
+        if existing:
+            file_id = existing.get("id")
+            existing_mime = existing.get("mimeType")
 
     # 2. UPDATE existing file (This is fine without folder_id)
     if file_id and convert_to_sheets:
-        try:
-            meta = (
-                service.files()
-                .get(
-                    fileId=file_id,
-                    fields="id,mimeType",
-                    supportsAllDrives=True,
+        if existing_mime is None:
+            try:
+                meta = (
+                    service.files()
+                    .get(
+                        fileId=file_id,
+                        fields="id,mimeType",
+                        supportsAllDrives=True,
+                    )
+                    .execute()
                 )
-                .execute()
-            )
-            if meta.get("mimeType") != _SHEET_MIME:
-                file_id = None
-        except Exception:
+                existing_mime = meta.get("mimeType")
+            except Exception:
+                existing_mime = None
+        if existing_mime != _SHEET_MIME:
             file_id = None
 
     if file_id:
@@ -239,9 +357,10 @@ def upload_file(
             .update(
                 fileId=file_id,
                 media_body=media,
+                fields="id",
                 supportsAllDrives=True,
             )
-            .execute()
+            .execute(num_retries=_UPLOAD_RETRIES)
         )
         return updated.get("id")
 
@@ -269,6 +388,6 @@ def upload_file(
             fields="id",
             supportsAllDrives=True,
         )
-        .execute()
+        .execute(num_retries=_UPLOAD_RETRIES)
     )
     return created.get("id")
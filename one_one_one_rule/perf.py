@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import os
 import sys
 import time
 from functools import wraps
@@ -10,8 +11,21 @@ try:
 except Exception:  # pragma: no cover - platform-dependent
     resource = None
 
+try:
+    # Keep /proc/self/statm open so each probe is a single pread() syscall.
+    _STATM_FD = os.open("/proc/self/statm", os.O_RDONLY)
+    _PAGE_MB = os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+except (AttributeError, OSError, ValueError):  # pragma: no cover - non-Linux
+    _STATM_FD = None
+    _PAGE_MB = 0.0
+
+_LOGGER = logging.getLogger("pipeline")
+
 
 def _rss_mb() -> float:
+    if _STATM_FD is not None:
+        # Second field of statm is the resident set size in pages.
+        return int(os.pread(_STATM_FD, 64, 0).split()[1]) * _PAGE_MB
     if resource is None:
         return float("nan")
     usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
@@ -25,6 +39,10 @@ def log_perf(func):
 
     @wraps(func)
     def wrapper(*args, **kwargs):
+        # Skip all measurement when the perf line would be discarded anyway.
+        if not _LOGGER.isEnabledFor(logging.INFO):
+            return func(*args, **kwargs)
+
         start_wall = time.perf_counter()
         start_cpu = time.process_time()
         start_rss = _rss_mb()
@@ -33,14 +51,14 @@ def log_perf(func):
         finally:
             end_wall = time.perf_counter()
             end_cpu = time.process_time()
-            end_rss = _rss_mb()
 
             wall_ms = (end_wall - start_wall) * 1000.0
             cpu_ms = (end_cpu - start_cpu) * 1000.0
+            # Sub-millisecond calls cannot move RSS meaningfully; skip the second probe.
+            end_rss = start_rss if wall_ms < 1.0 else _rss_mb()
             delta_rss = end_rss - start_rss
 
-            logger = logging.getLogger("pipeline")
-            logger.info(
+            _LOGGER.info(
                 "perf %s wall_ms=%.2f cpu_ms=%.2f rss_mb=%.2f delta_rss_mb=%.2f",
                 f"{func.__module__}.{func.__name__}",
                 wall_ms,
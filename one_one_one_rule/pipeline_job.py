@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from datetime import datetime, timezone as dt_timezone
 import logging
+import os
+from pathlib import Path
 from zoneinfo import ZoneInfo
 
 import pandas as pd
 
-from .settings import load_settings
+from .settings import Settings, load_settings
 from .perf import log_perf
 from .load_drive import upload_csv, upload_file
 from .extract_tickers import load_nasdaq100_tickers
@@ -18,14 +20,9 @@ from .transform_valuation import (
 )
 
 
-@log_perf
-def _build_output(df: pd.DataFrame, as_of_date: str, run_ts_utc: str) -> pd.DataFrame:
-    # Insert run metadata and order columns for consistent downstream use.
-    df = df.copy()
-    df.insert(0, "as_of_date", as_of_date)
-    df.insert(1, "run_ts_utc", run_ts_utc)
-
-    ordered = [
+# Column order of the published CSV (consumed by Looker Studio and Apps Script).
+_OUTPUT_COLUMNS = pd.Index(
+    [
         "as_of_date",
         "run_ts_utc",
         "ticker",
@@ -56,9 +53,30 @@ def _build_output(df: pd.DataFrame, as_of_date: str, run_ts_utc: str) -> pd.Data
         "market_cap",
         "target_mean_price",
     ]
+)
+
+
+@log_perf
+def _build_output(df: pd.DataFrame, as_of_date: str, run_ts_utc: str) -> pd.DataFrame:
+    # Insert run metadata and order columns for consistent downstream use.
+    # Prepend the metadata columns instead of copying the whole frame to insert them.
+    meta = pd.DataFrame(
+        {"as_of_date": as_of_date, "run_ts_utc": run_ts_utc},
+        index=df.index,
+    )
+    df = pd.concat([meta, df], axis=1)
+
+    # Known columns first in a fixed order, then anything else in its existing order.
+    head = _OUTPUT_COLUMNS[_OUTPUT_COLUMNS.isin(df.columns)]
+    tail = df.columns.difference(_OUTPUT_COLUMNS, sort=False)
+    return df.reindex(columns=head.append(tail))
+
 
-    cols = [c for c in ordered if c in df.columns] + [c for c in df.columns if c not in ordered]
-    return df[cols]
+def _write_atomic(path: Path, data: bytes) -> None:
+    # Write to a temp file and rename it, so readers never see a partial file.
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
 
 
 @log_perf
@@ -79,7 +97,6 @@ def _setup_logger(log_path) -> logging.Logger:
     return logger
 
 
-@log_perf
 def main() -> None:
     settings = load_settings()
     timezone = ZoneInfo(settings.timezone)
@@ -103,6 +120,19 @@ def main() -> None:
     logger.info("Pipeline start")
     logger.info("as_of_date=%s run_ts_utc=%s", as_of_date, run_ts_utc)
 
+    # Run the timed body only after the logger is configured, so its perf line is kept.
+    _run_pipeline(settings, logger, log_path, log_name, as_of_date, run_ts_utc)
+
+
+@log_perf
+def _run_pipeline(
+    settings: Settings,
+    logger: logging.Logger,
+    log_path: Path,
+    log_name: str,
+    as_of_date: str,
+    run_ts_utc: str,
+) -> None:
     try:
         # 1) Extract tickers.
         tickers = load_nasdaq100_tickers(
@@ -112,7 +142,11 @@ def main() -> None:
         logger.info("Loaded tickers: %d", len(tickers))
 
         # 2) Fetch fundamentals and compute valuations.
-        fundamentals = fetch_fundamentals(tickers)
+        fundamentals = fetch_fundamentals(
+            tickers,
+            cache_file=settings.fundamentals_cache_file,
+            cache_ttl_seconds=settings.fundamentals_cache_ttl,
+        )
         logger.info("Fetched fundamentals rows: %d", len(fundamentals))
         fundamentals = cleanse_fundamentals(fundamentals)
         logger.info("After cleansing rows: %d", len(fundamentals))
@@ -129,7 +163,9 @@ def main() -> None:
         # 3) Write local outputs (latest + optional dated copy).
         settings.output_dir.mkdir(parents=True, exist_ok=True)
         latest_path = settings.output_dir / settings.output_basename
-        output.to_csv(latest_path, index=False)
+        # Serialize once; the same bytes feed both files and the Drive upload.
+        csv_bytes = output.to_csv(index=False).encode("utf-8")
+        _write_atomic(latest_path, csv_bytes)
         logger.info("Wrote latest CSV: %s", latest_path)
 
         dated_name = None
@@ -138,10 +174,14 @@ def main() -> None:
             dated_name = f"nasdaq100_valuations_{as_of_date}.csv"
             dated_path = settings.output_dir / dated_name
             if dated_path != latest_path:
-                output.to_csv(dated_path, index=False)
+                _write_atomic(dated_path, csv_bytes)
             logger.info("Wrote dated CSV: %s", dated_path)
 
-        # 4) Upload data (and optional log) to Google Drive.
+        # 4) Upload data, then the optional log, to Google Drive.
+        # The log is uploaded only after the data upload has finished, so the uploaded copy
+        # is complete and includes the data upload's result; a failed data upload is logged
+        # and still followed by the log upload, then re-raised.
+        errors = []
         if settings.upload_to_drive:
             if settings.drive_auth_mode == "service_account" and not settings.drive_service_account_file.exists():
                 raise RuntimeError(
@@ -153,32 +193,43 @@ def main() -> None:
                 upload_path = dated_path
                 upload_name = dated_name
 
-            file_id = upload_csv(
-                file_path=upload_path,
-                service_account_file=settings.drive_service_account_file,
-                file_name=upload_name,
-                folder_id=settings.drive_folder_id,
-                file_id=settings.drive_file_id,
-                auth_mode=settings.drive_auth_mode,
-                oauth_client_file=settings.drive_oauth_client_file,
-                oauth_token_file=settings.drive_oauth_token_file,
-                convert_to_sheets=settings.drive_convert_to_sheets,
-            )
-            logger.info("Uploaded data to Drive: %s", file_id)
+            try:
+                file_id = upload_csv(
+                    file_path=upload_path,
+                    service_account_file=settings.drive_service_account_file,
+                    file_name=upload_name,
+                    folder_id=settings.drive_folder_id,
+                    file_id=settings.drive_file_id,
+                    auth_mode=settings.drive_auth_mode,
+                    oauth_client_file=settings.drive_oauth_client_file,
+                    oauth_token_file=settings.drive_oauth_token_file,
+                    convert_to_sheets=settings.drive_convert_to_sheets,
+                    content=csv_bytes,
+                )
+                logger.info("Uploaded data to Drive: %s", file_id)
+            except Exception as exc:
+                logger.error("Failed to upload data to Drive: %s", exc)
+                errors.append(exc)
 
         if settings.upload_log_to_drive:
-            log_id = upload_file(
-                file_path=log_path,
-                service_account_file=settings.drive_service_account_file,
-                file_name=log_name,
-                folder_id=settings.drive_folder_id,
-                auth_mode=settings.drive_auth_mode,
-                oauth_client_file=settings.drive_oauth_client_file,
-                oauth_token_file=settings.drive_oauth_token_file,
-                mime_type="text/plain",
-                convert_to_sheets=False,
-            )
-            logger.info("Uploaded log to Drive: %s", log_id)
+            try:
+                log_id = upload_file(
+                    file_path=log_path,
+                    service_account_file=settings.drive_service_account_file,
+                    file_name=log_name,
+                    folder_id=settings.drive_folder_id,
+                    auth_mode=settings.drive_auth_mode,
+                    oauth_client_file=settings.drive_oauth_client_file,
+                    oauth_token_file=settings.drive_oauth_token_file,
+                    mime_type="text/plain",
+                    convert_to_sheets=False,
+                )
+                logger.info("Uploaded log to Drive: %s", log_id)
+            except Exception as exc:
+                logger.error("Failed to upload log to Drive: %s", exc)
+                errors.append(exc)
+        if errors:
+            raise errors[0]
 
         logger.info("Pipeline finished")
     except Exception:
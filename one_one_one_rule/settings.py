@@ -1,5 +1,6 @@
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -10,7 +11,6 @@ from .perf import log_perf
 load_dotenv("config/.env", override=False)
 
 
-@log_perf
 def _env_bool(key: str, default: bool = False) -> bool:
     # Parse common truthy values from environment variables.
     raw = os.getenv(key)
@@ -19,7 +19,7 @@ def _env_bool(key: str, default: bool = False) -> bool:
     return raw.strip().lower() in {"1", "true", "yes", "y", "on"}
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Settings:
     # Centralized pipeline settings loaded from .env.
     timezone: str
@@ -34,6 +34,8 @@ class Settings:
 
     use_wikipedia_tickers: bool
     ticker_fallback_file: Path
+    fundamentals_cache_file: Path | None
+    fundamentals_cache_ttl: int
 
     upload_to_drive: bool
     drive_auth_mode: str
@@ -51,8 +53,10 @@ class Settings:
 
 
 @log_perf
+@lru_cache(maxsize=1)
 def load_settings() -> Settings:
     # Build settings with sane defaults to keep the pipeline reproducible.
+    # Cached: the environment is loaded once per process, so settings are static.
     timezone = os.getenv("PIPELINE_TIMEZONE", "Asia/Bangkok")
     output_dir = Path(os.getenv("OUTPUT_DIR", "data"))
     output_basename = os.getenv("OUTPUT_BASENAME", "nasdaq100_latest.csv")
@@ -66,6 +70,9 @@ def load_settings() -> Settings:
 
     use_wikipedia_tickers = _env_bool("USE_WIKIPEDIA_TICKERS", True)
     ticker_fallback_file = Path(os.getenv("TICKER_FALLBACK_FILE", "data/nasdaq100_tickers.csv"))
+    fundamentals_cache_raw = os.getenv("FUNDAMENTALS_CACHE_FILE", "").strip()
+    fundamentals_cache_file = Path(fundamentals_cache_raw) if fundamentals_cache_raw else None
+    fundamentals_cache_ttl = int(os.getenv("FUNDAMENTALS_CACHE_TTL", "3600"))
 
     upload_to_drive = _env_bool("UPLOAD_TO_DRIVE", True)
     drive_auth_mode = os.getenv("GOOGLE_DRIVE_AUTH_MODE", "oauth").strip().lower()
@@ -99,6 +106,8 @@ def load_settings() -> Settings:
         margin_of_safety_min=margin_of_safety_min,
         use_wikipedia_tickers=use_wikipedia_tickers,
         ticker_fallback_file=ticker_fallback_file,
+        fundamentals_cache_file=fundamentals_cache_file,
+        fundamentals_cache_ttl=fundamentals_cache_ttl,
         upload_to_drive=upload_to_drive,
         drive_service_account_file=drive_service_account_file,
         drive_auth_mode=drive_auth_mode,
@@ -1,23 +1,62 @@
 from __future__ import annotations
 
+import json
+import logging
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
-import pandera.pandas as pa
 import yfinance as yf
+from yfinance.exceptions import YFException
 
 from .perf import log_perf
 
-def _safe_float(value) -> float:
-    # Convert to float safely; return NaN on failure.
-    try:
-        if value is None:
-            return float("nan")
-        return float(value)
-    except Exception:
-        return float("nan")
-
+# Copy-on-Write is always on from pandas 3.0; opt in explicitly on pandas 2.x so
+# column assignments and slices share memory instead of copying eagerly.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# Network/HTTP failures (requests and curl_cffi errors are OSErrors), yfinance
+# errors and malformed payloads. Anything else is a bug and should propagate.
+_FETCH_ERRORS = (OSError, YFException, KeyError, ValueError)
+
+# Numeric fundamentals coerced by cleanse_fundamentals.
+_NUMERIC_COLUMNS = (
+    "price",
+    "market_cap",
+    "trailing_pe",
+    "forward_pe",
+    "trailing_eps",
+    "forward_eps",
+    "earnings_growth",
+    "peg_ratio",
+    "book_value_per_share",
+    "target_mean_price",
+)
+
+# Storage dtype for per-share fundamentals and derived metrics; float32 halves the memory
+# the vectorized valuation passes stream through. market_cap stays float64 because
+# trillion-dollar values are not exactly representable in float32.
+_FLOAT_DTYPE = np.float32
+_FLOAT64_COLUMNS = ("market_cap",)
+
+# Fixed category sets for the low-cardinality label columns (stored as int8 codes).
+_CHECK_LABELS = ["pass", "fail", "unknown"]
+_VALUATION_LABELS = ["undervalued", "fair", "overvalued", "unknown"]
+_PEG_SOURCES = ["reported", "derived", "missing"]
+_FAIR_VALUE_SOURCES = [
+    "graham_value",
+    "target_mean_price",
+    "sector_median_trailing_pe",
+    "sector_median_forward_pe",
+    "missing",
+]
 
 def _first_value(*values):
     # Return the first non-empty value.
@@ -39,19 +78,29 @@ class ValuationThresholds:
     margin_of_safety_min: float
 
 
-def _fetch_snapshot(ticker: str) -> dict:
+def _fetch_snapshot(ticker: str, yf_ticker: yf.Ticker) -> tuple[dict, bool]:
     # Pull a single ticker snapshot from yfinance.
+    # The flag is False when either request failed, so the partial row is not cached.
     info = {}
     fast = {}
-    yf_ticker = yf.Ticker(ticker)
+    complete = True
     try:
         info = yf_ticker.info or {}
-    except Exception:
+    except _FETCH_ERRORS as exc:
+        logging.getLogger("pipeline").warning("Failed to fetch info for %s: %s", ticker, exc)
         info = {}
+        complete = False
+    # fast_info is lazy: its requests fire on key access, so read the fields inside the try.
     try:
-        fast = yf_ticker.fast_info or {}
-    except Exception:
+        fast_info = yf_ticker.fast_info
+        fast = {
+            key: fast_info.get(key)
+            for key in ("last_price", "regular_market_price", "market_cap", "currency")
+        }
+    except _FETCH_ERRORS as exc:
+        logging.getLogger("pipeline").warning("Failed to fetch fast_info for %s: %s", ticker, exc)
         fast = {}
+        complete = False
 
     price = _first_value(
         fast.get("last_price"),
@@ -69,41 +118,132 @@ def _fetch_snapshot(ticker: str) -> dict:
         info.get("currency"),
     )
 
-    return {
+    # Sector and currency repeat across tickers; interning shares one str per distinct value.
+    row = {
         "ticker": ticker,
         "company": info.get("shortName") or info.get("longName") or "",
-        "sector": info.get("sector") or "Unknown",
-        "price": _safe_float(price),
-        "market_cap": _safe_float(market_cap),
-        "currency": currency or "",
-        "trailing_pe": _safe_float(info.get("trailingPE")),
-        "forward_pe": _safe_float(info.get("forwardPE")),
-        "trailing_eps": _safe_float(info.get("trailingEps")),
-        "forward_eps": _safe_float(info.get("forwardEps")),
-        "earnings_growth": _safe_float(info.get("earningsGrowth")),
-        "peg_ratio": _safe_float(info.get("pegRatio")),
-        "book_value_per_share": _safe_float(info.get("bookValue")),
-        "target_mean_price": _safe_float(info.get("targetMeanPrice")),
+        "sector": sys.intern(info.get("sector") or "Unknown"),
+        "price": price,
+        "market_cap": market_cap,
+        "currency": sys.intern(currency if isinstance(currency, str) else ""),
+        "trailing_pe": info.get("trailingPE"),
+        "forward_pe": info.get("forwardPE"),
+        "trailing_eps": info.get("trailingEps"),
+        "forward_eps": info.get("forwardEps"),
+        "earnings_growth": info.get("earningsGrowth"),
+        "peg_ratio": info.get("pegRatio"),
+        "book_value_per_share": info.get("bookValue"),
+        "target_mean_price": info.get("targetMeanPrice"),
+    }
+    return row, complete
+
+
+def _read_cache_entries(path: Path, cutoff: float) -> dict[str, dict]:
+    # Return well-formed cache entries fetched at or after cutoff; a missing, unreadable or
+    # malformed file (or entry) is just a cache miss.
+    try:
+        entries = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(entries, dict):
+        return {}
+    return {
+        ticker: entry
+        for ticker, entry in entries.items()
+        if isinstance(entry, dict)
+        and isinstance(entry.get("snapshot"), dict)
+        and isinstance(entry.get("fetched_at"), (int, float))
+        and entry["fetched_at"] >= cutoff
     }
 
 
+def _load_snapshot_cache(path: Path, ttl_seconds: float) -> dict[str, dict]:
+    # Read cached snapshots that are still within the TTL.
+    entries = _read_cache_entries(path, time.time() - ttl_seconds)
+    return {ticker: entry["snapshot"] for ticker, entry in entries.items()}
+
+
+def _json_value(value):
+    # NaN/inf are not valid JSON; store them as null (read back as NaN).
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _save_snapshot_cache(path: Path, snapshots: list[dict], ttl_seconds: float) -> None:
+    # Persist snapshots with their fetch time and drop expired entries, so the file stays
+    # bounded; write to a sibling file then swap it in.
+    # The cache is only an optimization: a failed write is logged and the run carries on.
+    fetched_at = time.time()
+    entries = _read_cache_entries(path, fetched_at - ttl_seconds)
+    for row in snapshots:
+        entries[row["ticker"]] = {
+            "fetched_at": fetched_at,
+            "snapshot": {key: _json_value(value) for key, value in row.items()},
+        }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(entries, allow_nan=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as exc:
+        logging.getLogger("pipeline").warning("Failed to write fundamentals cache %s: %s", path, exc)
+
+
 @log_perf
-def fetch_fundamentals(tickers: list[str]) -> pd.DataFrame:
+def fetch_fundamentals(
+    tickers: list[str],
+    max_workers: int = 8,
+    cache_file: Path | None = None,
+    cache_ttl_seconds: float = 3600,
+) -> pd.DataFrame:
     # Batch fetch fundamentals for all tickers.
-    rows = []
-    for ticker in tickers:
-        rows.append(_fetch_snapshot(ticker))
-    return pd.DataFrame(rows)
+    # With a cache file, snapshots younger than the TTL are reused and only the rest hit Yahoo.
+    cached = _load_snapshot_cache(cache_file, cache_ttl_seconds) if cache_file else {}
+    missing = [ticker for ticker in tickers if ticker not in cached]
+
+    # One Tickers manager builds every Ticker on the shared yfinance session; each snapshot
+    # is network-bound, so fetch them on a thread pool; map keeps ticker order.
+    results: list[tuple[dict, bool]] = []
+    if missing:
+        manager = yf.Tickers(missing)
+        workers = max(1, min(max_workers, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    _fetch_snapshot,
+                    missing,
+                    [manager.tickers[ticker.upper()] for ticker in missing],
+                )
+            )
+
+    # Snapshots keep yfinance's raw values; coerce whole columns at once instead of per value.
+    snapshots = cached | {row["ticker"]: row for row, _ in results}
+    df = _coerce_numeric(pd.DataFrame([snapshots[ticker] for ticker in tickers]))
+    if cache_file and results:
+        # Only cache rows where both requests succeeded and a price came back, so a transient
+        # failure (e.g. a rate-limited info call) is retried next run instead of for the TTL.
+        complete = [row["ticker"] for row, ok in results if ok]
+        cacheable = df[df["ticker"].isin(complete) & df["price"].notna()]
+        _save_snapshot_cache(cache_file, cacheable.to_dict("records"), cache_ttl_seconds)
+    return df
+
+
+def _coerce_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    # Coerce numeric columns to float64; unparseable values become NaN.
+    present = [col for col in _NUMERIC_COLUMNS if col in df.columns]
+    return df.assign(
+        **{col: pd.to_numeric(df[col], errors="coerce").astype("float64") for col in present}
+    )
 
 
 @log_perf
 def cleanse_fundamentals(df: pd.DataFrame) -> pd.DataFrame:
     # Normalize symbols, coerce types, and remove invalid values.
-    df = df.copy()
-
+    # Every step returns a new frame (assign/where), so the caller's frame is never mutated.
     if "ticker" in df.columns:
-        df["ticker"] = (
-            df["ticker"]
+        df = df.assign(
+            ticker=df["ticker"]
             .astype(str)
             .str.strip()
             .str.upper()
@@ -112,142 +252,149 @@ def cleanse_fundamentals(df: pd.DataFrame) -> pd.DataFrame:
         df = df[df["ticker"].notna() & (df["ticker"] != "")]
         df = df.drop_duplicates(subset=["ticker"], keep="first")
 
-    schema = pa.DataFrameSchema(
-        {
-            "ticker": pa.Column(str, nullable=True, coerce=True),
-            "company": pa.Column(str, nullable=True, coerce=True),
-            "sector": pa.Column(str, nullable=True, coerce=True),
-            "price": pa.Column(float, nullable=True, coerce=True),
-            "market_cap": pa.Column(float, nullable=True, coerce=True),
-            "trailing_pe": pa.Column(float, nullable=True, coerce=True),
-            "forward_pe": pa.Column(float, nullable=True, coerce=True),
-            "trailing_eps": pa.Column(float, nullable=True, coerce=True),
-            "forward_eps": pa.Column(float, nullable=True, coerce=True),
-            "earnings_growth": pa.Column(float, nullable=True, coerce=True),
-            "peg_ratio": pa.Column(float, nullable=True, coerce=True),
-            "book_value_per_share": pa.Column(float, nullable=True, coerce=True),
-            "target_mean_price": pa.Column(float, nullable=True, coerce=True),
-        },
-        coerce=True,
-        strict=False,
-    )
-
-    try:
-        df = schema.validate(df, lazy=True)
-    except pa.errors.SchemaErrors as exc:
-        df = exc.data
+    # Only type coercion is needed here, so use a plain dtype map rather than a schema library.
+    df = _coerce_numeric(df)
 
-    df.replace([np.inf, -np.inf], np.nan, inplace=True)
+    df = df.replace([np.inf, -np.inf], np.nan)
 
     if "price" in df.columns:
-        df.loc[df["price"] <= 0, "price"] = np.nan
+        df = df.assign(price=df["price"].where(df["price"] > 0))
     if "market_cap" in df.columns:
-        df.loc[df["market_cap"] <= 0, "market_cap"] = np.nan
+        df = df.assign(market_cap=df["market_cap"].where(df["market_cap"] > 0))
     if "sector" in df.columns:
-        df["sector"] = df["sector"].replace("", "Unknown").fillna("Unknown")
-
-    return df
-
-
-def _select_fair_value(row: pd.Series, sector_median_pe, overall_median_pe, sector_median_fpe, overall_median_fpe):
-    # Choose the best available fair value estimate.
-    graham_value = row.get("graham_value")
-    if pd.notna(graham_value) and graham_value > 0:
-        return graham_value, "graham_value"
-
-    target_mean_price = row.get("target_mean_price")
-    if pd.notna(target_mean_price) and target_mean_price > 0:
-        return target_mean_price, "target_mean_price"
+        df = df.assign(
+            sector=df["sector"].replace("", "Unknown").fillna("Unknown").astype("category")
+        )
+    if "currency" in df.columns:
+        df = df.assign(currency=df["currency"].fillna("").astype("category"))
 
-    trailing_eps = row.get("trailing_eps")
-    if pd.notna(trailing_eps) and trailing_eps > 0:
-        pe = sector_median_pe.get(row.get("sector"))
-        if pd.isna(pe):
-            pe = overall_median_pe
-        if pd.notna(pe) and pe > 0:
-            return trailing_eps * pe, "sector_median_trailing_pe"
+    return df.astype(
+        {
+            col: _FLOAT_DTYPE
+            for col in _NUMERIC_COLUMNS
+            if col in df.columns and col not in _FLOAT64_COLUMNS
+        }
+    )
 
-    forward_eps = row.get("forward_eps")
-    if pd.notna(forward_eps) and forward_eps > 0:
-        pe = sector_median_fpe.get(row.get("sector"))
-        if pd.isna(pe):
-            pe = overall_median_fpe
-        if pd.notna(pe) and pe > 0:
-            return forward_eps * pe, "sector_median_forward_pe"
 
-    return float("nan"), "missing"
+def _sector_medians(codes: np.ndarray, n_sectors: int, values: np.ndarray) -> np.ndarray:
+    # Per-row median of values within each row's sector code, ignoring NaN.
+    medians = np.full(n_sectors, np.nan, dtype=values.dtype)
+    for code in range(n_sectors):
+        group = values[codes == code]
+        group = group[~np.isnan(group)]
+        if group.size:
+            medians[code] = np.median(group)
+    # factorize marks missing sectors with -1; those rows get no sector median.
+    return np.where(codes >= 0, medians[codes], np.nan)
+
+
+def _select_fair_value(
+    df: pd.DataFrame,
+    fpe_median_used: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Choose the best available fair value estimate, in priority order, for every row.
+    graham_value = df["graham_value"].to_numpy(dtype=_FLOAT_DTYPE)
+    target_mean_price = df["target_mean_price"].to_numpy(dtype=_FLOAT_DTYPE)
+    trailing_eps = df["trailing_eps"].to_numpy(dtype=_FLOAT_DTYPE)
+    forward_eps = df["forward_eps"].to_numpy(dtype=_FLOAT_DTYPE)
+    pe = df["pe_median_used"].to_numpy(dtype=_FLOAT_DTYPE)
+    fpe = fpe_median_used
+
+    # NaN compares False, so each mask also rules out missing inputs.
+    use_graham = graham_value > 0
+    use_target = target_mean_price > 0
+    use_trailing = (trailing_eps > 0) & (pe > 0)
+    use_forward = (forward_eps > 0) & (fpe > 0)
+
+    # One priority list drives both selects: the first true mask picks value and source.
+    masks = [use_graham, use_target, use_trailing, use_forward]
+    fair_values = np.select(
+        masks,
+        [graham_value, target_mean_price, trailing_eps * pe, forward_eps * fpe],
+        default=np.nan,
+    )
+    fair_sources = np.select(
+        masks,
+        ["graham_value", "target_mean_price", "sector_median_trailing_pe", "sector_median_forward_pe"],
+        default="missing",
+    )
+    return fair_values, pd.Categorical(fair_sources, categories=_FAIR_VALUE_SOURCES)
 
 
-def _compute_graham_value(row: pd.Series) -> float:
+def _compute_graham_value(eps: np.ndarray, book_value: np.ndarray) -> np.ndarray:
     # Graham number based on EPS and book value.
-    eps = row.get("trailing_eps")
-    book_value = row.get("book_value_per_share")
-    if pd.notna(eps) and pd.notna(book_value) and eps > 0 and book_value > 0:
-        return float(np.sqrt(22.5 * eps * book_value))
-    return float("nan")
-
-
-def _compute_peg_ratio(row: pd.Series) -> tuple[float, str]:
+    # ufunc where= only touches valid lanes, so sqrt never sees a negative product.
+    valid = (eps > 0) & (book_value > 0)
+    graham = np.full(eps.shape, np.nan, dtype=eps.dtype)
+    np.multiply(eps, 22.5, out=graham, where=valid)
+    np.multiply(graham, book_value, out=graham, where=valid)
+    np.sqrt(graham, out=graham, where=valid)
+    return graham
+
+
+def _compute_peg_ratio(
+    peg_ratio: np.ndarray,
+    trailing_pe: np.ndarray,
+    earnings_growth: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
     # Use reported PEG when available, otherwise derive it.
-    peg_ratio = row.get("peg_ratio")
-    if pd.notna(peg_ratio) and peg_ratio > 0:
-        return float(peg_ratio), "reported"
-
-    trailing_pe = row.get("trailing_pe")
-    earnings_growth = row.get("earnings_growth")
-    if pd.notna(trailing_pe) and trailing_pe > 0 and pd.notna(earnings_growth) and earnings_growth > 0:
-        growth_pct = earnings_growth * 100 if earnings_growth <= 1 else earnings_growth
-        if growth_pct > 0:
-            return float(trailing_pe) / float(growth_pct), "derived"
+    reported = peg_ratio > 0
+    derived = ~reported & (trailing_pe > 0) & (earnings_growth > 0)
+    growth_pct = np.where(earnings_growth <= 1, earnings_growth * 100, earnings_growth)
+    # Divide only where derived holds (positive growth), so no zero-division guard is needed.
+    peg_values = np.where(reported, peg_ratio, np.nan)
+    np.divide(trailing_pe, growth_pct, out=peg_values, where=derived)
+    peg_sources = np.select([reported, derived], ["reported", "derived"], default="missing")
+    return peg_values, pd.Categorical(peg_sources, categories=_PEG_SOURCES)
 
-    return float("nan"), "missing"
 
-
-def _pass_fail_unknown(valid: bool, condition: bool) -> str:
+def _pass_fail_unknown(valid: np.ndarray, condition: np.ndarray) -> pd.Categorical:
     # Normalize boolean checks into pass/fail/unknown.
-    if not valid:
-        return "unknown"
-    return "pass" if condition else "fail"
+    labels = np.select([~valid, condition], ["unknown", "pass"], default="fail")
+    return pd.Categorical(labels, categories=_CHECK_LABELS)
 
 
 @log_perf
 def apply_valuation(df: pd.DataFrame, thresholds: ValuationThresholds) -> pd.DataFrame:
     # Compute valuation metrics and classification labels.
-    sector_median_pe = df.groupby("sector")["trailing_pe"].median()
-    overall_median_pe = df["trailing_pe"].median()
-    sector_median_fpe = df.groupby("sector")["forward_pe"].median()
-    overall_median_fpe = df["forward_pe"].median()
-
-    df = df.copy()
-
-    graham_values = []
-    peg_values = []
-    peg_sources = []
-    for _, row in df.iterrows():
-        graham_values.append(_compute_graham_value(row))
-        peg_value, peg_source = _compute_peg_ratio(row)
-        peg_values.append(peg_value)
-        peg_sources.append(peg_source)
-
-    df["graham_value"] = graham_values
-    df["peg_ratio"] = peg_values
-    df["peg_ratio_source"] = peg_sources
-    df["sector_median_pe"] = df["sector"].map(sector_median_pe)
-    df["pe_median_used"] = df["sector_median_pe"].fillna(overall_median_pe)
-
-    fair_values = []
-    fair_sources = []
-    for _, row in df.iterrows():
-        fair_value, source = _select_fair_value(
-            row,
-            sector_median_pe,
-            overall_median_pe,
-            sector_median_fpe,
-            overall_median_fpe,
-        )
-        fair_values.append(fair_value)
-        fair_sources.append(source)
+    # Group by integer sector codes instead of going through pandas groupby.
+    codes, sectors = pd.factorize(df["sector"])
+    trailing_pe = df["trailing_pe"].to_numpy(dtype=_FLOAT_DTYPE)
+    sector_median_pe = _sector_medians(codes, len(sectors), trailing_pe)
+    overall_median_pe = _FLOAT_DTYPE(df["trailing_pe"].median())
+    sector_median_fpe = _sector_medians(
+        codes, len(sectors), df["forward_pe"].to_numpy(dtype=_FLOAT_DTYPE)
+    )
+    overall_median_fpe = _FLOAT_DTYPE(df["forward_pe"].median())
 
+    graham_values = _compute_graham_value(
+        df["trailing_eps"].to_numpy(dtype=_FLOAT_DTYPE),
+        df["book_value_per_share"].to_numpy(dtype=_FLOAT_DTYPE),
+    )
+    peg_values, peg_sources = _compute_peg_ratio(
+        df["peg_ratio"].to_numpy(dtype=_FLOAT_DTYPE),
+        trailing_pe,
+        df["earnings_growth"].to_numpy(dtype=_FLOAT_DTYPE),
+    )
+    pe_median_used = np.where(np.isnan(sector_median_pe), overall_median_pe, sector_median_pe)
+    # The P/E check reuses these arrays instead of reading the new columns back from df.
+    pe_vs_sector_pass = _pass_fail_unknown(
+        ~np.isnan(trailing_pe) & ~np.isnan(pe_median_used),
+        trailing_pe <= pe_median_used * thresholds.pe_sector_max_mult,
+    )
+
+    # assign returns a new frame, so later column writes never touch the caller's frame.
+    df = df.assign(
+        graham_value=graham_values,
+        peg_ratio=peg_values,
+        peg_ratio_source=peg_sources,
+        sector_median_pe=sector_median_pe,
+        pe_median_used=pe_median_used,
+    )
+
+    fpe_median_used = np.where(np.isnan(sector_median_fpe), overall_median_fpe, sector_median_fpe)
+    fair_values, fair_sources = _select_fair_value(df, fpe_median_used)
     df["fair_value"] = fair_values
     df["fair_value_source"] = fair_sources
 
@@ -257,53 +404,51 @@ def apply_valuation(df: pd.DataFrame, thresholds: ValuationThresholds) -> pd.Dat
         np.nan,
     )
 
-    peg_valid = df["peg_ratio"].notna() & (df["peg_ratio"] > 0)
-    df["peg_pass"] = [
-        _pass_fail_unknown(valid, value < thresholds.peg_max)
-        for valid, value in zip(peg_valid, df["peg_ratio"])
-    ]
-
-    pe_valid = df["trailing_pe"].notna() & df["pe_median_used"].notna()
-    df["pe_vs_sector_pass"] = [
-        _pass_fail_unknown(
-            valid,
-            pe <= (median_pe * thresholds.pe_sector_max_mult),
-        )
-        for valid, pe, median_pe in zip(pe_valid, df["trailing_pe"], df["pe_median_used"])
-    ]
-
-    mos_valid = df["margin_of_safety"].notna()
-    df["margin_of_safety_pass"] = [
-        _pass_fail_unknown(valid, mos >= thresholds.margin_of_safety_min)
-        for valid, mos in zip(mos_valid, df["margin_of_safety"])
-    ]
-
-    def hunter_classify(row: pd.Series) -> str:
-        checks = [
-            row.get("peg_pass"),
-            row.get("pe_vs_sector_pass"),
-            row.get("margin_of_safety_pass"),
+    df["peg_pass"] = _pass_fail_unknown(peg_values > 0, peg_values < thresholds.peg_max)
+    df["pe_vs_sector_pass"] = pe_vs_sector_pass
+
+    margin_of_safety = df["margin_of_safety"].to_numpy(dtype=_FLOAT_DTYPE)
+    df["margin_of_safety_pass"] = _pass_fail_unknown(
+        ~np.isnan(margin_of_safety),
+        margin_of_safety >= thresholds.margin_of_safety_min,
+    )
+
+    # Combine the three checks on their int8 category codes rather than label strings.
+    checks = np.column_stack(
+        [
+            df[col].cat.codes.to_numpy()
+            for col in ("peg_pass", "pe_vs_sector_pass", "margin_of_safety_pass")
         ]
-        if any(value == "unknown" for value in checks):
-            return "unknown"
-        if all(value == "pass" for value in checks):
-            return "pass"
-        return "fail"
-
-    df["valuation_hunter"] = df.apply(hunter_classify, axis=1)
-
-    def classify(row: pd.Series) -> str:
-        price = row.get("price")
-        fair_value = row.get("fair_value")
-        if pd.isna(price) or pd.isna(fair_value) or fair_value <= 0:
-            return "unknown"
-        if price <= fair_value * thresholds.undervalued:
-            return "undervalued"
-        if price >= fair_value * thresholds.overvalued:
-            return "overvalued"
-        return "fair"
-
-    df["valuation"] = df.apply(classify, axis=1)
+    )
+    df["valuation_hunter"] = pd.Categorical(
+        np.select(
+            [
+                (checks == _CHECK_LABELS.index("unknown")).any(axis=1),
+                (checks == _CHECK_LABELS.index("pass")).all(axis=1),
+            ],
+            ["unknown", "pass"],
+            default="fail",
+        ),
+        categories=_CHECK_LABELS,
+    )
+
+    price = df["price"].to_numpy(dtype=_FLOAT_DTYPE)
+    fair_value = df["fair_value"].to_numpy(dtype=_FLOAT_DTYPE)
+    valid = ~np.isnan(price) & (fair_value > 0)
+    df["valuation"] = pd.Categorical(
+        np.select(
+            [
+                ~valid,
+                price <= fair_value * thresholds.undervalued,
+                price >= fair_value * thresholds.overvalued,
+            ],
+            ["unknown", "undervalued", "overvalued"],
+            default="fair",
+        ),
+        categories=_VALUATION_LABELS,
+    )
     df["pct_diff"] = (df["price"] - df["fair_value"]) / df["fair_value"]
 
+    # Derived metrics must stay in the storage dtype; a float64 here means something upcast.
+    assert df["fair_value"].dtype == _FLOAT_DTYPE, df["fair_value"].dtype
     return df
@@ -8,9 +8,12 @@ import certifi
 
 WIKI_URL = "https://en.wikipedia.org/wiki/Nasdaq-100"
 OUTPUT_PATH = Path("data/nasdaq100_tickers.csv")
+ETAG_PATH = Path("data/.nasdaq100.etag")
+TICKER_COL_NAMES = frozenset({"ticker", "ticker symbol", "symbol"})
 
 
-def fetch_tickers() -> list[str]:
+def fetch_tickers(etag: str | None = None) -> tuple[list[str] | None, str | None]:
+    # Return (tickers, etag); tickers is None when the page is unchanged since etag.
     headers = {
         "User-Agent": (
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -18,38 +21,54 @@ def fetch_tickers() -> list[str]:
             "Chrome/121.0.0.0 Safari/537.36"
         )
     }
+    if etag:
+        headers["If-None-Match"] = etag
     resp = requests.get(WIKI_URL, headers=headers, timeout=20, verify=certifi.where())
+    if resp.status_code == 304:
+        return None, etag
     resp.raise_for_status()
 
-    tables = pd.read_html(io.StringIO(resp.text))
-    component_table = None
-    for table in tables:
-        cols = [str(c).strip().lower() for c in table.columns]
-        if any(c in cols for c in ("ticker", "ticker symbol", "symbol")):
-            component_table = table
-            break
-
-    if component_table is None:
-        raise RuntimeError("ไม่พบตารางรายชื่อ Nasdaq-100 จาก Wikipedia")
-
-    ticker_col = None
-    for c in component_table.columns:
-        if str(c).strip().lower() in ("ticker", "ticker symbol", "symbol"):
-            ticker_col = c
-            break
-    if ticker_col is None:
-        ticker_col = component_table.columns[0]
-
-    tickers = component_table[ticker_col].astype(str).str.strip().str.upper()
+    # Parse only the components table (id="constituents"), and pin lxml to avoid the slow
+    # bs4 fallback; read_html raises ValueError when no table matches.
+    try:
+        tables = pd.read_html(
+            io.StringIO(resp.text),
+            match="Ticker|Symbol",
+            attrs={"id": "constituents"},
+            flavor="lxml",
+        )
+    except ValueError as exc:
+        raise RuntimeError("ไม่พบตารางรายชื่อ Nasdaq-100 จาก Wikipedia") from exc
+    component_table = tables[0]
+
+    # Normalize the header once; fall back to the first column when no ticker header exists.
+    cols = component_table.columns.astype(str).str.strip().str.lower()
+    matches = cols.isin(TICKER_COL_NAMES).nonzero()[0]
+    ticker_pos = matches[0] if len(matches) else 0
+
+    tickers = component_table.iloc[:, ticker_pos].astype(str).str.strip().str.upper()
     tickers = tickers.str.replace(".", "-", regex=False)
     unique = sorted(set(t for t in tickers.tolist() if t))
-    return unique
+    return unique, resp.headers.get("ETag")
 
 
 def main() -> None:
-    tickers = fetch_tickers()
+    # Only revalidate with the stored ETag while the CSV it describes still exists.
+    etag = None
+    if OUTPUT_PATH.exists() and ETAG_PATH.exists():
+        etag = ETAG_PATH.read_text(encoding="utf-8").strip() or None
+
+    tickers, new_etag = fetch_tickers(etag)
+    if tickers is None:
+        print(f"{OUTPUT_PATH} is up to date (Wikipedia page not modified)")
+        return
+
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     pd.DataFrame({"Symbol": tickers}).to_csv(OUTPUT_PATH, index=False)
+    if new_etag:
+        ETAG_PATH.write_text(new_etag, encoding="utf-8")
+    else:
+        ETAG_PATH.unlink(missing_ok=True)
     print(f"Updated {OUTPUT_PATH} with {len(tickers)} tickers")
 
 
@@ -1,5 +1,6 @@
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -36,22 +37,41 @@ def upload_file_to_drive(file_path: Path, file_name_override: str | None = None)
         return None
 
 
+def upload_files_to_drive(file_paths: list[Path]) -> list[str | None]:
+    # Uploads are network-bound and share the cached Drive client, so run them concurrently.
+    if len(file_paths) == 1:
+        return [upload_file_to_drive(file_paths[0])]
+    # A fixed GOOGLE_DRIVE_FILE_ID would make every upload overwrite the same Drive file.
+    if load_settings().drive_file_id:
+        print("❌ เกิดข้อผิดพลาด: GOOGLE_DRIVE_FILE_ID ใช้ได้เมื่ออัปโหลดไฟล์เดียวเท่านั้น")
+        return [None] * len(file_paths)
+    with ThreadPoolExecutor(max_workers=min(4, len(file_paths))) as executor:
+        return list(executor.map(upload_file_to_drive, file_paths))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Upload a file to Google Drive (uses .env settings)")
     parser.add_argument(
         "--file",
-        default="test_upload_oauth.txt",
-        help="Path to a local file to upload",
+        nargs="+",
+        default=["test_upload_oauth.txt"],
+        help="Path(s) to local files to upload",
     )
     parser.add_argument(
         "--file-name",
         default="",
-        help="Optional Drive file name override",
+        help="Optional Drive file name override (single file only)",
     )
     args = parser.parse_args()
 
-    file_path = Path(args.file)
-    if not file_path.exists():
-        file_path.write_text("ไฟล์ทดสอบการอัปโหลดด้วย OAuth 2.0 สำหรับ Gmail ส่วนตัว", encoding="utf-8")
+    file_paths = [Path(f) for f in args.file]
+    if args.file_name and len(file_paths) > 1:
+        parser.error("--file-name ใช้ได้เมื่ออัปโหลดไฟล์เดียวเท่านั้น")
+    for file_path in file_paths:
+        if not file_path.exists():
+            file_path.write_text("ไฟล์ทดสอบการอัปโหลดด้วย OAuth 2.0 สำหรับ Gmail ส่วนตัว", encoding="utf-8")
 
-    upload_file_to_drive(file_path, file_name_override=args.file_name or None)
+    if args.file_name:
+        upload_file_to_drive(file_paths[0], file_name_override=args.file_name)
+    else:
+        upload_files_to_drive(file_paths)